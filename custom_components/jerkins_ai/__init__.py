@@ -1,19 +1,25 @@
 """The Jerkins AI integration."""
 import asyncio
+import hashlib
+import json
 import logging
-from datetime import timedelta
+import random
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
 
 import aiohttp
-import async_timeout
 import voluptuous as vol
 
+try:
+    import orjson
+except ImportError:  # orjson ships with Home Assistant, but don't require it
+    orjson = None
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback, ServiceCall
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.event import async_track_time_interval
-from homeassistant.helpers.entity_registry import async_get
-from homeassistant.helpers.entity import Entity
-from homeassistant.helpers import area_registry
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
 from homeassistant.const import (
     CONF_URL,
 )
@@ -21,16 +27,59 @@ from homeassistant.helpers import config_validation as cv
 
 from .const import (
     DOMAIN,
+    ATTRIBUTE_ALLOWLIST,
     CONF_SENSORS,
     CONF_AREA_MAPPINGS,
     CONF_ACTION_MAPPINGS,
     CONF_POLLING_INTERVAL,
+    CONFIG_SAVE_DELAY,
+    DATA_LLM_SEMAPHORES,
     DEFAULT_POLLING_INTERVAL,
+    LLM_CACHE_SIZE,
+    LLM_CACHE_TTL,
+    LLM_CONNECT_TIMEOUT,
+    LLM_GENERATION_TIMEOUT,
+    LLM_READ_TIMEOUT,
+    LLM_RETRY_ATTEMPTS,
+    LLM_RETRY_INITIAL_DELAY,
+    LLM_RETRY_MAX_DELAY,
+    MAX_CONCURRENT_ACTIONS,
+    MAX_CONCURRENT_LLM_REQUESTS,
+    POLLING_BACKOFF_MAX,
+    POLLING_BACKOFF_THRESHOLD,
+    STATE_CHANGE_DEBOUNCE,
     SUPPORTED_DOMAINS,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Static parts of the LLM prompt
+PROMPT_PREFIX = "You are the house brain. Analyze the following sensor data:\n\n"
+PROMPT_SUFFIX = (
+    "\n\n"
+    "If you think an action should be taken based on this data, respond with a "
+    "JSON object with the format: {\"action\": \"action_name\", \"parameters\": {}}.\n"
+    "If several actions should be taken, respond with a JSON list of such objects.\n"
+    "If no action is needed, respond with an empty JSON object: {}."
+)
+
+# Static parts of the Ollama request body, serialized once
+# (uses the default model, can be configured later)
+PAYLOAD_PREFIX = b'{"model":"jerkins","stream":true,"format":"json","prompt":'
+PAYLOAD_SUFFIX = b"}"
+
+# Digest of the model and prompt template, so cached LLM decisions
+# are tied to the request they were made for
+REQUEST_TEMPLATE_DIGEST = hashlib.blake2b(
+    PAYLOAD_PREFIX + PROMPT_PREFIX.encode() + PROMPT_SUFFIX.encode(), digest_size=16
+).digest()
+
+# Binary sensor states reported to the LLM as True
+TRUE_STATES = frozenset({"on", "true", "yes", "open", "detected", "home"})
+
+# Attributes that change without the sensor reading changing
+VOLATILE_ATTRIBUTES = frozenset({"last_changed", "last_updated", "last_reset"})
+
 # Service schemas
 FORCE_UPDATE_SCHEMA = vol.Schema({
     vol.Optional("entry_id"): cv.string,
@@ -48,6 +97,13 @@ UPDATE_ACTION_MAPPINGS_SCHEMA = vol.Schema({
     vol.Required("actions"): cv.string,
 })
 
+# Services registered by the integration, with their schemas
+SERVICES = {
+    "force_update": FORCE_UPDATE_SCHEMA,
+    "update_area_mappings": UPDATE_AREA_MAPPINGS_SCHEMA,
+    "update_action_mappings": UPDATE_ACTION_MAPPINGS_SCHEMA,
+}
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Jerkins AI from a config entry."""
     hass.data.setdefault(DOMAIN, {})
@@ -64,13 +120,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         
         if entry_id:
             if entry_id in hass.data[DOMAIN]:
-                await hass.data[DOMAIN][entry_id].async_update()
+                await hass.data[DOMAIN][entry_id].async_update(force=True)
             else:
                 _LOGGER.error("Config entry %s not found", entry_id)
         else:
             # Update all instances
             for jerkins_instance in hass.data[DOMAIN].values():
-                await jerkins_instance.async_update()
+                await jerkins_instance.async_update(force=True)
     
     async def update_area_mappings_service(call: ServiceCall) -> None:
         """Handle the service call to update area mappings."""
@@ -91,44 +147,71 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         area_id = call.data.get("area_id")
         actions_str = call.data.get("actions")
         
+        if actions_str is None:
+            _LOGGER.error("No actions provided for area %s", area_id)
+            return
+        
         # Parse actions string into a list
         actions = [action.strip() for action in actions_str.split(",") if action.strip()]
         
         if entry_id in hass.data[DOMAIN]:
             jerkins_instance = hass.data[DOMAIN][entry_id]
+            # Skip the config entry write when nothing changed
+            if jerkins_instance.action_mappings.get(area_id) == actions:
+                _LOGGER.debug("Action mapping for area %s is unchanged", area_id)
+                return
+            
             # Update the action mapping
             await jerkins_instance.async_update_action_mapping(area_id, actions)
         else:
             _LOGGER.error("Config entry %s not found", entry_id)
     
     # Register the services
-    hass.services.async_register(
-        DOMAIN, "force_update", force_update_service, schema=FORCE_UPDATE_SCHEMA
-    )
-    
-    hass.services.async_register(
-        DOMAIN, "update_area_mappings", update_area_mappings_service, schema=UPDATE_AREA_MAPPINGS_SCHEMA
-    )
-    
-    hass.services.async_register(
-        DOMAIN, "update_action_mappings", update_action_mappings_service, schema=UPDATE_ACTION_MAPPINGS_SCHEMA
-    )
+    handlers = {
+        "force_update": force_update_service,
+        "update_area_mappings": update_area_mappings_service,
+        "update_action_mappings": update_action_mappings_service,
+    }
+    for service, schema in SERVICES.items():
+        hass.services.async_register(DOMAIN, service, handlers[service], schema=schema)
     
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    jerkins_ai = hass.data[DOMAIN].pop(entry.entry_id)
+    jerkins_ai = hass.data[DOMAIN].pop(entry.entry_id, None)
+    if jerkins_ai is None:
+        # Already unloaded
+        return True
+    
     await jerkins_ai.async_unload()
     
     # If this is the last instance, unregister the services
     if not hass.data[DOMAIN]:
-        for service in ["force_update", "update_area_mappings", "update_action_mappings"]:
+        for service in SERVICES:
             hass.services.async_remove(DOMAIN, service)
     
     return True
 
 
+def _json_dumps(obj, sort_keys=False):
+    """Serialize an object to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, default=str, option=orjson.OPT_SORT_KEYS if sort_keys else 0
+        )
+    return json.dumps(
+        obj, default=str, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def _json_loads(data):
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class JerkinsAI:
     """Main class for Jerkins AI integration."""
 
@@ -137,65 +220,252 @@ class JerkinsAI:
         self.hass = hass
         self.entry = entry
         self.llm_url = entry.data.get(CONF_URL)
-        self.sensors = entry.data.get(CONF_SENSORS, [])
-        self.area_mappings = entry.data.get(CONF_AREA_MAPPINGS, {})
-        self.action_mappings = entry.data.get(CONF_ACTION_MAPPINGS, {})
+        self._llm_endpoint = self._normalize_ollama_url(self.llm_url)
+        # Keep sensor order for the LLM but drop duplicates
+        self.sensors = tuple(dict.fromkeys(entry.data.get(CONF_SENSORS, [])))
+        self._sensors_set = frozenset(self.sensors)
+        self._binary_sensors = frozenset(
+            sensor for sensor in self.sensors if sensor.startswith("binary_sensor.")
+        )
+        # Copy the mappings so in-place updates don't alias the entry data
+        self.area_mappings = dict(entry.data.get(CONF_AREA_MAPPINGS, {}))
+        self.action_mappings = dict(entry.data.get(CONF_ACTION_MAPPINGS, {}))
+        self._parsed_actions = self._parse_actions(self.action_mappings)
+        self._valid_actions_cache = {}
         self.polling_interval = entry.data.get(
             CONF_POLLING_INTERVAL, DEFAULT_POLLING_INTERVAL
         )
-        self._unsubscribe_polling = None
+        self._polling_handle = None
+        self._polling_backoff = 1
+        self._unchanged_updates = 0
+        self._pending_update = None
+        self._pending_save = None
+        self._update_tasks = set()
+        self._unsubscribe_state_changes = None
+        self._llm_cache = OrderedDict()
+        # LLM concurrency limits shared by all instances using the same endpoint
+        llm_semaphores = hass.data.setdefault(DATA_LLM_SEMAPHORES, {})
+        self._llm_semaphore = llm_semaphores.setdefault(
+            self._llm_endpoint, asyncio.Semaphore(MAX_CONCURRENT_LLM_REQUESTS)
+        )
+        self._action_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ACTIONS)
+        self._last_fingerprint = None
+        self._sensor_payload_cache = {}
         self.session = None
 
     async def async_setup(self):
         """Set up the Jerkins AI integration."""
-        self.session = async_get_clientsession(self.hass)
+        # Use a dedicated session so the keep-alive connection to the LLM
+        # is not evicted by other Home Assistant traffic
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=4,
+                limit_per_host=2,
+                keepalive_timeout=120,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True,
+            ),
+            # Bound connecting and each streamed read, and cap the whole
+            # generation so a slow stream can't hold a shared LLM slot forever
+            timeout=aiohttp.ClientTimeout(
+                total=LLM_GENERATION_TIMEOUT,
+                connect=LLM_CONNECT_TIMEOUT,
+                sock_read=LLM_READ_TIMEOUT,
+            ),
+        )
         
-        # Start periodic polling
-        self._unsubscribe_polling = async_track_time_interval(
-            self.hass,
-            self.async_update,
-            timedelta(seconds=self.polling_interval),
+        # React to sensor state changes as they happen
+        self._unsubscribe_state_changes = async_track_state_change_event(
+            self.hass, self.sensors, self._handle_state_change
         )
         
-        # Do initial update
-        await self.async_update()
+        # Keep polling as a safety net for missed state changes
+        self._schedule_polling()
+        
+        # Do initial update in the background, so a failing first update
+        # doesn't fail the entry setup after everything above is running
+        self._start_update()
 
         return True
 
     async def async_unload(self):
         """Unload the Jerkins AI integration."""
-        if self._unsubscribe_polling:
-            self._unsubscribe_polling()
-            self._unsubscribe_polling = None
+        if self._unsubscribe_state_changes:
+            self._unsubscribe_state_changes()
+            self._unsubscribe_state_changes = None
+        
+        if self._pending_update:
+            self._pending_update.cancel()
+            self._pending_update = None
+        
+        if self._polling_handle:
+            self._polling_handle.cancel()
+            self._polling_handle = None
+        
+        # Stop running updates before their session is closed
+        update_tasks = list(self._update_tasks)
+        for task in update_tasks:
+            task.cancel()
+        if update_tasks:
+            await asyncio.gather(*update_tasks, return_exceptions=True)
+        
+        # Don't lose mapping changes that are still waiting to be saved
+        if self._pending_save:
+            self._pending_save()
+            self._save_mappings()
+        
+        if self.session:
+            await self.session.close()
+            self.session = None
+        
+        self._release_llm_semaphore()
             
         return True
 
-    async def async_update(self, *_):
+    @callback
+    def _release_llm_semaphore(self):
+        """Drop the shared LLM semaphore once no other entry uses the endpoint."""
+        llm_semaphores = self.hass.data.get(DATA_LLM_SEMAPHORES, {})
+        
+        if not any(
+            instance is not self and instance._llm_endpoint == self._llm_endpoint
+            for instance in self.hass.data[DOMAIN].values()
+        ):
+            llm_semaphores.pop(self._llm_endpoint, None)
+        
+        if not llm_semaphores:
+            self.hass.data.pop(DATA_LLM_SEMAPHORES, None)
+
+    @callback
+    def _schedule_save(self):
+        """Persist mapping changes, coalescing bursts into one write."""
+        if self._pending_save:
+            self._pending_save()
+        
+        self._pending_save = async_call_later(
+            self.hass, CONFIG_SAVE_DELAY, self._save_mappings
+        )
+
+    @callback
+    def _save_mappings(self, *_):
+        """Write the current mappings to the config entry."""
+        self._pending_save = None
+        
+        new_data = {
+            **self.entry.data,
+            CONF_AREA_MAPPINGS: dict(self.area_mappings),
+            CONF_ACTION_MAPPINGS: dict(self.action_mappings),
+        }
+        
+        self.hass.config_entries.async_update_entry(
+            self.entry, data=new_data
+        )
+
+    @callback
+    def _schedule_polling(self):
+        """Schedule the next polling update on the event loop."""
+        # A plain loop timer avoids building a datetime on every tick
+        self._polling_handle = self.hass.loop.call_later(
+            self.polling_interval * self._polling_backoff, self._handle_polling
+        )
+
+    @callback
+    def _handle_polling(self):
+        """Reschedule polling and run an update."""
+        self._schedule_polling()
+        self._start_update(polled=True)
+
+    @callback
+    def _track_polling_backoff(self, changed):
+        """Adapt the polling interval to how often sensor states change."""
+        if changed:
+            # Step back toward the base interval when something changes
+            self._unchanged_updates = 0
+            self._polling_backoff = max(self._polling_backoff // 2, 1)
+            return
+        
+        # Double the interval after a run of unchanged updates
+        self._unchanged_updates += 1
+        if self._unchanged_updates >= POLLING_BACKOFF_THRESHOLD:
+            self._unchanged_updates = 0
+            self._polling_backoff = min(self._polling_backoff * 2, POLLING_BACKOFF_MAX)
+
+    @callback
+    def _handle_state_change(self, event):
+        """Debounce sensor state changes into a single update."""
+        if self._pending_update:
+            self._pending_update.cancel()
+        
+        self._pending_update = self.hass.loop.call_later(
+            STATE_CHANGE_DEBOUNCE, self._handle_pending_update
+        )
+
+    @callback
+    def _handle_pending_update(self):
+        """Run an update for the debounced state changes."""
+        self._pending_update = None
+        self._start_update()
+
+    @callback
+    def _start_update(self, **kwargs):
+        """Run an update in the background, keeping its task for unload."""
+        task = self.hass.async_create_task(self.async_update(**kwargs))
+        self._update_tasks.add(task)
+        task.add_done_callback(self._update_tasks.discard)
+
+    async def async_update(self, *_, force=False, polled=False):
         """Update sensor data and send to LLM for decision making."""
-        try:
-            # Collect sensor data with area information
-            sensor_data = await self._collect_sensor_data()
+        # Validate the configured actions once per update cycle and share
+        # the result between data collection and response processing
+        valid_actions = self._validate_actions("default")
+
+        # Collect sensor data with area information
+        sensor_data = self._collect_sensor_data(list(valid_actions))
+        
+        if not sensor_data:
+            _LOGGER.warning("No sensor data collected, skipping LLM communication")
+            return
+        
+        # Skip the LLM entirely when nothing changed since it last answered
+        fingerprint = self._state_fingerprint(sensor_data, valid_actions)
+        if not force and fingerprint == self._last_fingerprint:
+            _LOGGER.debug("Sensor states unchanged, skipping LLM communication")
+            if polled:
+                self._track_polling_backoff(changed=False)
+            return
+        
+        # Only polls measure how often states change between polls
+        if polled:
+            self._track_polling_backoff(changed=True)
             
-            if not sensor_data:
-                _LOGGER.warning("No sensor data collected, skipping LLM communication")
-                return
-                
+        # Reuse a recent LLM decision for an equivalent sensor snapshot
+        try:
+            cache_key = self._llm_cache_key(sensor_data)
+        except (TypeError, ValueError):
+            # Attribute values that can't be serialized
+            _LOGGER.exception("Error serializing sensor data")
+            return
+        llm_response = self._get_cached_llm_response(cache_key)
+        
+        if llm_response is None:
             # Send data to LLM
             llm_response = await self._communicate_with_llm(sensor_data)
+            if llm_response is not None:
+                self._cache_llm_response(cache_key, llm_response)
+        
+        if llm_response is not None:
+            self._last_fingerprint = fingerprint
+        
+        if llm_response is None:
+            _LOGGER.warning("No response from LLM, no actions taken")
+            return
             
-            if not llm_response:
-                _LOGGER.warning("No response from LLM, no actions taken")
-                return
-                
-            # Process LLM response and execute actions
-            await self._process_llm_response(llm_response)
-            
-        except Exception as exc:
-            _LOGGER.error("Error during update: %s", exc)
+        # Process LLM response and execute actions
+        await self._process_llm_response(llm_response, valid_actions)
     
     async def async_update_area_mapping(self, sensor_id, area_id):
         """Update the area mapping for a sensor."""
-        if sensor_id not in self.sensors:
+        if sensor_id not in self._sensors_set:
             _LOGGER.error("Sensor %s is not configured in this integration", sensor_id)
             return False
         
@@ -203,12 +473,7 @@ class JerkinsAI:
         self.area_mappings[sensor_id] = area_id
         
         # Save changes to config entry
-        new_data = {**self.entry.data}
-        new_data[CONF_AREA_MAPPINGS] = self.area_mappings
-        
-        self.hass.config_entries.async_update_entry(
-            self.entry, data=new_data
-        )
+        self._schedule_save()
         
         _LOGGER.info("Updated area mapping for sensor %s to area %s", sensor_id, area_id)
         return True
@@ -217,219 +482,382 @@ class JerkinsAI:
         """Update the available actions for an area."""
         # Update action mapping
         self.action_mappings[area_id] = actions
+        self._parsed_actions = self._parse_actions(self.action_mappings)
+        self._valid_actions_cache.clear()
+        self._sensor_payload_cache.clear()
         
         # Save changes to config entry
-        new_data = {**self.entry.data}
-        new_data[CONF_ACTION_MAPPINGS] = self.action_mappings
-        
-        self.hass.config_entries.async_update_entry(
-            self.entry, data=new_data
-        )
+        self._schedule_save()
         
         _LOGGER.info("Updated action mapping for area %s: %s", area_id, actions)
         return True
     
-    async def _collect_sensor_data(self):
+    @callback
+    def _collect_sensor_data(self, valid_actions):
         """Collect data from all configured sensors."""
         sensor_data = []
         
-        for sensor_entity_id in self.sensors:
+        # Snapshot only the configured sensors instead of every entity
+        get_state = self.hass.states.get
+        states = [(entity_id, get_state(entity_id)) for entity_id in self.sensors]
+        
+        for sensor_entity_id, state in states:
+            # Isolate failures so one bad sensor doesn't drop the batch
             try:
-                state = self.hass.states.get(sensor_entity_id)
-                
-                if not state:
-                    _LOGGER.warning("Sensor %s not found", sensor_entity_id)
-                    continue
-                
-                # Format the state value appropriately for binary sensors vs regular sensors
-                state_value = state.state
-                sensor_type = "sensor"
-                
-                # Special handling for binary sensors
-                if sensor_entity_id.startswith("binary_sensor."):
-                    sensor_type = "binary_sensor"
-                    # Convert on/off, true/false to boolean for clearer understanding by LLM
-                    if state_value.lower() in ['on', 'true', 'yes', 'open', 'detected', 'home']:
-                        state_value = True
-                    else:
-                        state_value = False
-                
-                # Get available actions
-                available_actions = self.action_mappings.get("default", [])
-                valid_actions = await self._validate_actions(available_actions)
-                
-                sensor_info = {
-                    "entity_id": sensor_entity_id,
-                    "name": state.name,
-                    "state": state_value,
-                    "attributes": state.attributes,
-                    "type": sensor_type,
-                    "available_actions": valid_actions
-                }
-                
+                sensor_info = self._collect_sensor_info(sensor_entity_id, state, valid_actions)
+            except (KeyError, AttributeError, TypeError, ValueError):
+                _LOGGER.exception("Error collecting data for sensor %s", sensor_entity_id)
+                continue
+            
+            if sensor_info:
                 sensor_data.append(sensor_info)
-                
-            except Exception as exc:
-                _LOGGER.error("Error collecting data for sensor %s: %s", sensor_entity_id, exc)
         
         return sensor_data
     
-    async def _validate_actions(self, configured_actions):
-        """Validate that configured actions are still valid."""
-        valid_actions = []
-        
-        for action in configured_actions:
-            # Handle service calls (contains a dot)
-            if "." in action:
-                domain, service = action.split(".", 1)
-                
-                # Check if this domain is in our supported domains
-                if domain not in SUPPORTED_DOMAINS:
-                    _LOGGER.debug("Domain %s not in supported domains", domain)
-                    continue
-                
-                # All service calls are considered valid
-                valid_actions.append(action)
+    @callback
+    def _collect_sensor_info(self, sensor_entity_id, state, valid_actions):
+        """Collect data from a single sensor."""
+        if not state:
+            _LOGGER.warning("Sensor %s not found", sensor_entity_id)
+            return None
+        
+        # Reuse the previous payload while the sensor state is unchanged
+        fingerprint = (state.state, state.last_updated)
+        cached = self._sensor_payload_cache.get(sensor_entity_id)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        
+        # Format the state value appropriately for binary sensors vs regular sensors
+        state_value = state.state
+        sensor_type = "sensor"
+        
+        # Special handling for binary sensors
+        if sensor_entity_id in self._binary_sensors:
+            sensor_type = "binary_sensor"
+            # Convert on/off, true/false to boolean for clearer understanding by LLM
+            state_value = state_value.lower() in TRUE_STATES
+        
+        sensor_info = {
+            "entity_id": sensor_entity_id,
+            "name": state.name,
+            "state": state_value,
+            "attributes": {
+                key: round(value, 2) if isinstance(value, float) else value
+                for key, value in state.attributes.items()
+                if key in ATTRIBUTE_ALLOWLIST
+            },
+            "type": sensor_type,
+            "available_actions": valid_actions
+        }
+        
+        self._sensor_payload_cache[sensor_entity_id] = (fingerprint, sensor_info)
+        return sensor_info
+    
+    @staticmethod
+    def _normalize_ollama_url(url):
+        """Build the Ollama generate endpoint from the configured URL."""
+        if not url:
+            return None
+        
+        # Make sure the URL format is correct for Ollama
+        if not url.startswith("http://") and not url.startswith("https://"):
+            url = f"http://{url}"
+            
+        # Ensure URL ends with /api/generate for Ollama
+        if not url.endswith("/api/generate"):
+            if url.endswith("/"):
+                url = f"{url}api/generate"
             else:
-                # Custom actions are always considered valid
-                valid_actions.append(action)
+                url = f"{url}/api/generate"
+        
+        _LOGGER.debug("Using LLM URL: %s", url)
+        return url
+    
+    @staticmethod
+    def _parse_actions(action_mappings):
+        """Split configured actions into (action, domain, service) tuples per area."""
+        parsed_actions = {}
+        
+        for area_id, actions in action_mappings.items():
+            parsed = []
+            for action in actions:
+                # Service calls contain a dot, custom actions do not
+                domain, separator, service = action.partition(".")
+                if separator:
+                    parsed.append((action, domain, service))
+                else:
+                    parsed.append((action, None, None))
+            parsed_actions[area_id] = tuple(parsed)
+        
+        return parsed_actions
+    
+    @callback
+    def _validate_actions(self, area_id):
+        """Validate that configured actions for an area are still valid."""
+        # Configured actions only change through async_update_action_mapping
+        if area_id in self._valid_actions_cache:
+            return self._valid_actions_cache[area_id]
+        
+        valid_actions = {}
+        supported_domains = SUPPORTED_DOMAINS
+        
+        for action, domain, service in self._parsed_actions.get(area_id, ()):
+            # Check if service calls are in our supported domains
+            if domain is not None and domain not in supported_domains:
+                _LOGGER.debug("Domain %s not in supported domains", domain)
+                continue
+            
+            # Supported service calls and custom actions are considered valid
+            valid_actions[action] = (domain, service)
         
+        self._valid_actions_cache[area_id] = valid_actions
         return valid_actions
     
+    @staticmethod
+    def _state_fingerprint(sensor_data, valid_actions):
+        """Fingerprint the sensor states and actions offered to the LLM."""
+        parts = [f"{sensor['entity_id']}={sensor['state']}" for sensor in sensor_data]
+        parts.extend(valid_actions)
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=16).digest()
+    
+    @classmethod
+    def _canonicalize(cls, value):
+        """Normalize sensor data so equivalent snapshots compare equal."""
+        if isinstance(value, float):
+            return round(value, 2)
+        if isinstance(value, Mapping):
+            return {
+                key: cls._canonicalize(item)
+                for key, item in value.items()
+                if key not in VOLATILE_ATTRIBUTES
+            }
+        if isinstance(value, (list, tuple)):
+            return [cls._canonicalize(item) for item in value]
+        return value
+    
+    def _llm_cache_key(self, sensor_data):
+        """Build the LLM cache key for a sensor snapshot and model."""
+        canonical = _json_dumps(self._canonicalize(sensor_data), sort_keys=True)
+        return hashlib.blake2b(
+            REQUEST_TEMPLATE_DIGEST + canonical, digest_size=16
+        ).digest()
+    
+    def _get_cached_llm_response(self, cache_key):
+        """Return a cached LLM response if it has not expired."""
+        cached = self._llm_cache.get(cache_key)
+        if cached is None:
+            return None
+        
+        expires, llm_response = cached
+        if expires < time.monotonic():
+            del self._llm_cache[cache_key]
+            return None
+        
+        self._llm_cache.move_to_end(cache_key)
+        _LOGGER.debug("Using cached LLM response")
+        return llm_response
+    
+    def _cache_llm_response(self, cache_key, llm_response):
+        """Store an LLM response, evicting the least recently used entries."""
+        self._llm_cache[cache_key] = (time.monotonic() + LLM_CACHE_TTL, llm_response)
+        self._llm_cache.move_to_end(cache_key)
+        
+        while len(self._llm_cache) > LLM_CACHE_SIZE:
+            self._llm_cache.popitem(last=False)
+    
     async def _communicate_with_llm(self, sensor_data):
         """Send sensor data to the LLM and get decisions."""
-        if not self.llm_url:
+        if not self._llm_endpoint:
             _LOGGER.error("LLM URL not configured")
             return None
             
         try:
-            # Make sure the URL format is correct for Ollama
-            llm_url = self.llm_url
-            if not llm_url.startswith("http://") and not llm_url.startswith("https://"):
-                llm_url = f"http://{llm_url}"
-                
-            # Ensure URL ends with /api/generate for Ollama
-            if not llm_url.endswith("/api/generate"):
-                if llm_url.endswith("/"):
-                    llm_url = f"{llm_url}api/generate"
-                else:
-                    llm_url = f"{llm_url}/api/generate"
+            # Format the payload for Ollama's API around the static parts
+            # Compact JSON keeps the prompt (and token count) small
+            sensor_json = _json_dumps(sensor_data).decode()
+            prompt = f"{PROMPT_PREFIX}{sensor_json}{PROMPT_SUFFIX}"
+            body = PAYLOAD_PREFIX + _json_dumps(prompt) + PAYLOAD_SUFFIX
             
-            _LOGGER.debug("Using LLM URL: %s", llm_url)
+            _LOGGER.debug("Sending request to LLM: %s", body)
             
-            # Format the payload for Ollama's API
-            prompt = (
-                "You are the house brain. Analyze the following sensor data:\n\n"
-                f"{sensor_data}\n\n"
-                "If you think an action should be taken based on this data, respond with a "
-                "JSON object with the format: {\"action\": \"action_name\", \"parameters\": {}}.\n"
-                "If no action is needed, respond with an empty JSON object: {}."
-            )
-            
-            payload = {
-                "model": "jerkins",  # Use default model, can be configured later
-                "prompt": prompt,
-                "stream": False,
-                "format": "json"
-            }
+            response_data = await self._post_to_llm(body)
+            if response_data is None:
+                return None
             
-            _LOGGER.debug("Sending request to LLM: %s", payload)
+            _LOGGER.debug("LLM response: %s", response_data)
             
-            async with async_timeout.timeout(30):
-                async with self.session.post(llm_url, json=payload) as response:
+            # Extract the actual response from Ollama's response structure
+            # Ollama returns {"model": "...", "response": "...", ...}
+            if "response" in response_data:
+                try:
+                    # Try to parse the response as JSON
+                    return _json_loads(response_data["response"])
+                except json.JSONDecodeError:
+                    _LOGGER.error("Failed to parse LLM response as JSON: %s", 
+                                 response_data["response"])
+                    return None
+            else:
+                _LOGGER.error("Unexpected response format from LLM: %s", response_data)
+                return None
+                
+        except asyncio.TimeoutError:
+            _LOGGER.error("Timeout communicating with LLM")
+            return None
+        except aiohttp.ClientError as exc:
+            _LOGGER.error("Error communicating with LLM: %s", exc)
+            return None
+        except json.JSONDecodeError as exc:
+            _LOGGER.error("Invalid JSON received from LLM: %s", exc)
+            return None
+        except (TypeError, ValueError) as exc:
+            # Unserializable sensor data, undecodable or oversized response lines
+            _LOGGER.error("Invalid data exchanged with LLM: %s", exc)
+            return None
+    
+    async def _post_to_llm(self, body):
+        """Post a request body to the LLM, retrying transient failures."""
+        for attempt in range(1, LLM_RETRY_ATTEMPTS + 1):
+            try:
+                # Bound concurrent requests during bursts, but release the
+                # slot while waiting to retry
+                async with self._llm_semaphore, self.session.post(
+                    self._llm_endpoint,
+                    data=body,
+                    headers={"Content-Type": "application/json"},
+                ) as response:
+                    # Server errors are usually transient, so retry them
+                    if response.status >= 500:
+                        response.raise_for_status()
+                    
+                    # Client errors are configuration problems, so don't retry
                     if response.status != 200:
                         _LOGGER.error("LLM request failed with status %s: %s", 
                                      response.status, await response.text())
                         return None
                     
-                    # Parse Ollama response format
-                    response_data = await response.json()
-                    _LOGGER.debug("LLM response: %s", response_data)
-                    
-                    # Extract the actual response from Ollama's response structure
-                    # Ollama returns {"model": "...", "response": "...", ...}
-                    if "response" in response_data:
-                        try:
-                            import json
-                            # Try to parse the response as JSON
-                            return json.loads(response_data["response"])
-                        except json.JSONDecodeError:
-                            _LOGGER.error("Failed to parse LLM response as JSON: %s", 
-                                         response_data["response"])
+                    # Ollama streams NDJSON chunks that each carry part of the
+                    # response, so read them as they arrive until it is done
+                    response_parts = []
+                    done = False
+                    async for line in response.content:
+                        if not line.strip():
+                            continue
+                        
+                        chunk = _json_loads(line)
+                        if not isinstance(chunk, dict):
+                            _LOGGER.error("Unexpected chunk from LLM: %s", chunk)
+                            return None
+                        
+                        if "error" in chunk:
+                            _LOGGER.error("LLM returned an error: %s", chunk["error"])
+                            return None
+                        
+                        part = chunk.get("response", "")
+                        if not isinstance(part, str):
+                            _LOGGER.error("Unexpected chunk from LLM: %s", chunk)
                             return None
-                    else:
-                        _LOGGER.error("Unexpected response format from LLM: %s", response_data)
+                        response_parts.append(part)
+                        if chunk.get("done"):
+                            done = True
+                            break
+                    
+                    # A stream that ends early holds a truncated generation
+                    if not done:
+                        _LOGGER.error("LLM response stream ended before completion")
                         return None
                     
-        except asyncio.TimeoutError:
-            _LOGGER.error("Timeout communicating with LLM")
-            return None
-        except aiohttp.ClientError as exc:
-            _LOGGER.error("Error communicating with LLM: %s", exc)
-            return None
-        except Exception as exc:
-            _LOGGER.error("Unexpected error in LLM communication: %s", exc)
-            import traceback
-            _LOGGER.debug("Traceback: %s", traceback.format_exc())
-            return None
+                    return {"response": "".join(response_parts)}
+                    
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                if attempt == LLM_RETRY_ATTEMPTS:
+                    raise
+                
+                # Exponential backoff with jitter
+                delay = min(
+                    LLM_RETRY_INITIAL_DELAY * 2 ** (attempt - 1), LLM_RETRY_MAX_DELAY
+                ) + random.uniform(0, 1)
+                _LOGGER.debug(
+                    "LLM request attempt %s failed (%s), retrying in %.1f seconds",
+                    attempt, exc, delay
+                )
+                await asyncio.sleep(delay)
     
-    async def _process_llm_response(self, llm_response):
+    async def _process_llm_response(self, llm_response, valid_actions):
         """Process LLM response and execute actions."""
-        if not llm_response or not isinstance(llm_response, dict):
-            _LOGGER.warning("Invalid LLM response format")
-            return
-            
-        # Check if the response is empty (no actions needed)
+        # An empty response means no actions are needed
         if not llm_response:
             _LOGGER.info("LLM determined no actions needed")
             return
+        
+        # The LLM may answer with a single action or a list of actions
+        if isinstance(llm_response, dict):
+            llm_actions = [llm_response]
+        elif isinstance(llm_response, list):
+            llm_actions = llm_response
+        else:
+            _LOGGER.warning("Invalid LLM response format")
+            return
+            
+        actions_to_execute = []
+        
+        for llm_action in llm_actions:
+            if not isinstance(llm_action, dict):
+                _LOGGER.warning("Invalid LLM action format: %s", llm_action)
+                continue
             
-        try:
             # The expected format is: {"action": "action_name", "parameters": {}}
-            action = llm_response.get("action")
-            parameters = llm_response.get("parameters", {})
+            action = llm_action.get("action")
+            parameters = llm_action.get("parameters", {})
             
             if not action:
-                _LOGGER.warning("LLM response missing action: %s", llm_response)
-                return
-                
-            # Get current valid actions
-            configured_actions = self.action_mappings.get("default", [])
-            valid_actions = await self._validate_actions(configured_actions)
+                _LOGGER.warning("LLM response missing action: %s", llm_action)
+                continue
+            
+            if not isinstance(action, str):
+                _LOGGER.warning("LLM returned invalid action: %s", action)
+                continue
             
-            # Validate the action is available
+            if not isinstance(parameters, dict):
+                _LOGGER.warning("LLM returned invalid parameters: %s", parameters)
+                continue
+                
+            # Validate against the actions offered to the LLM in this cycle
             if action not in valid_actions:
                 _LOGGER.warning(
                     "LLM requested action '%s' not available. Available actions: %s",
-                    action, valid_actions
+                    action, list(valid_actions)
                 )
-                return
-                
-            # Execute the action
-            await self._execute_action(action, parameters)
+                continue
             
-        except Exception as exc:
-            _LOGGER.error("Error processing LLM response: %s", exc)
+            domain, service = valid_actions[action]
+            actions_to_execute.append((action, domain, service, parameters))
+            
+        # Execute the actions concurrently
+        await asyncio.gather(
+            *(
+                self._execute_action(action, domain, service, parameters)
+                for action, domain, service, parameters in actions_to_execute
+            )
+        )
     
-    async def _execute_action(self, action, parameters):
+    async def _execute_action(self, action, domain, service, parameters):
         """Execute an action in Home Assistant."""
         try:
             _LOGGER.info("Executing action '%s' with parameters: %s", 
                          action, parameters)
             
-            # Check if action is a service call (contains a dot)
-            if "." in action:
-                domain, service = action.split(".", 1)
-                
+            # Check if action is a service call (has a domain)
+            if domain is not None:
                 # Create service data with parameters
                 service_data = {**parameters}
                 
-                # Call the service
-                await self.hass.services.async_call(
-                    domain,
-                    service,
-                    service_data=service_data,
-                )
+                # Call the service, bounding concurrent calls from batched actions
+                async with self._action_semaphore:
+                    await self.hass.services.async_call(
+                        domain,
+                        service,
+                        service_data=service_data,
+                    )
                 
                 _LOGGER.info("Called service %s.%s with data %s", 
                             domain, service, service_data)
@@ -437,6 +865,5 @@ class JerkinsAI:
                 # Handle custom actions - could be implemented based on specific needs
                 _LOGGER.info("Custom action '%s' execution not yet implemented", action)
             
-        except Exception as exc:
+        except (HomeAssistantError, vol.Invalid) as exc:
             _LOGGER.error("Error executing action: %s", exc)
-``` 
\ No newline at end of file
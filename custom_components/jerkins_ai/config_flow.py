@@ -1,13 +1,15 @@
 """Config flow for Jerkins AI integration."""
 import logging
-from typing import Any, Dict, List, Optional
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.helpers import selector, area_registry
+from homeassistant.helpers import selector, area_registry, device_registry
 from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
 from homeassistant.const import (
     CONF_NAME,
@@ -36,210 +38,301 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+SENSOR_DOMAINS = frozenset({"sensor", "binary_sensor"})
+
+# An http(s) URL with a host and no whitespace
+URL_PATTERN = re.compile(r"^https?://[^\s/$.?#][^\s]*$")
+
+# Schemas for the steps whose forms never change
+USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME, default=DEFAULT_NAME): str,
+        # Updates follow state changes; polling only catches missed ones
+        vol.Required(CONF_POLLING_INTERVAL, default=DEFAULT_POLLING_INTERVAL): int,
+    }
+)
+LLM_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_URL): str,
+    }
+)
+
+# Selector options for entering a custom area or action
+CUSTOM_AREA_OPTION = {"value": "custom", "label": "Custom Area (enter name)"}
+CUSTOM_ACTION_OPTION = {"value": "custom", "label": "Custom Action (enter name)"}
+
+# Services offered per service category, paired with their display labels
+TOGGLE_SERVICES = tuple(
+    (service, service.replace('_', ' ').title())
+    for service in ("turn_on", "turn_off", "toggle")
+)
+COVER_SERVICES = tuple(
+    (service, service.replace('_', ' ').title().replace('Cover', ''))
+    for service in ("open_cover", "close_cover", "set_cover_position")
+)
+CLIMATE_SERVICES = tuple(
+    (service, service.replace('_', ' ').title().replace('Hvac', 'HVAC'))
+    for service in ("set_temperature", "set_hvac_mode")
+)
+MEDIA_SERVICES = tuple(
+    (service, service.replace('_', ' ').title().replace('Media', ''))
+    for service in ("play_media", "media_play", "media_pause", "media_stop", "volume_set")
+)
+
+
+def _build_domain_services() -> Dict[str, Tuple[Tuple[str, str], ...]]:
+    """Map each categorized domain to its (service ID, label) pairs."""
+    domain_services = {}
+    for domain in SERVICE_CATEGORY_TOGGLE:
+        domain_name = domain.replace('_', ' ').title()
+        domain_services[domain] = tuple(
+            (f"{domain}.{service}", f"{service_label} {domain_name}")
+            for service, service_label in TOGGLE_SERVICES
+        )
+    for domains, services in (
+        (SERVICE_CATEGORY_COVER, COVER_SERVICES),
+        (SERVICE_CATEGORY_CLIMATE, CLIMATE_SERVICES),
+        (SERVICE_CATEGORY_MEDIA, MEDIA_SERVICES),
+    ):
+        for domain in domains:
+            domain_services[domain] = tuple(
+                (f"{domain}.{service}", service_label)
+                for service, service_label in services
+            )
+    return domain_services
+
+
+DOMAIN_SERVICES = _build_domain_services()
+
+# Services offered when an area has no supported entities
+DEFAULT_SERVICES = {
+    "light.turn_on": "Turn On Lights",
+    "light.turn_off": "Turn Off Lights",
+    "switch.turn_on": "Turn On Switch",
+    "switch.turn_off": "Turn Off Switch",
+}
+
+
+@lru_cache(maxsize=128)
+def _area_name_variants(area_name: str) -> Tuple[str, str, str]:
+    """Get the lowercase, underscored and squashed forms of an area name."""
+    name = area_name.lower()
+    return name, name.replace(' ', '_'), name.replace(' ', '')
+
 
 def get_sensor_entities(hass: HomeAssistant) -> List[dict]:
     """Get all sensor and binary_sensor entities."""
-    states = hass.states.async_all()
-    sensor_options = []
-    
-    for state in states:
-        # Include both sensors and binary sensors
-        if state.domain == "sensor" or state.domain == "binary_sensor":
-            sensor_options.append({
-                "value": state.entity_id,
-                "label": f"{state.name} ({state.entity_id})"
-            })
+    registry_entries = async_get_entity_registry(hass).entities
     
-    return sensor_options
+    # Include both sensors and binary sensors, leaving out hidden entities
+    return [
+        {
+            "value": state.entity_id,
+            "label": f"{state.name} ({state.entity_id})"
+        }
+        for state in hass.states.async_all(SENSOR_DOMAINS)
+        if getattr(registry_entries.get(state.entity_id), "hidden_by", None) is None
+    ]
 
 
 def get_area_list(hass: HomeAssistant) -> List[dict]:
     """Get all areas in Home Assistant."""
     ar_registry = area_registry.async_get(hass)
-    area_options = []
-    
-    for area_id, area in ar_registry.areas.items():
-        area_options.append({
-            "value": area_id,
+    area_options = [
+        {
+            "value": area.id,
             "label": area.name
-        })
+        }
+        for area in ar_registry.areas.values()
+    ]
     
     # Add a custom area option
-    area_options.append({
-        "value": "custom",
-        "label": "Custom Area (enter name)"
-    })
+    area_options.append(CUSTOM_AREA_OPTION)
     
     return area_options
 
 
-def get_entity_area(hass: HomeAssistant, entity_id: str) -> Optional[str]:
+def get_registries(hass: HomeAssistant) -> Tuple[Any, Any, Any]:
+    """Get the entity, device and area registries."""
+    return (
+        async_get_entity_registry(hass),
+        device_registry.async_get(hass),
+        area_registry.async_get(hass),
+    )
+
+
+def get_entity_area(
+    hass: HomeAssistant, entity_id: str, *, registries: Optional[Tuple[Any, Any, Any]] = None
+) -> Optional[str]:
     """Get the area ID for an entity."""
-    try:
-        # Method 1: Check entity registry for direct area assignment
+    # Callers resolving many entities can fetch the registries once,
+    # otherwise each registry is only fetched once a method needs it
+    if registries is None:
         entity_registry = async_get_entity_registry(hass)
-        entity_entry = entity_registry.async_get(entity_id)
-        
-        if entity_entry and entity_entry.area_id:
-            _LOGGER.debug("Entity %s has direct area assignment: %s", entity_id, entity_entry.area_id)
-            return entity_entry.area_id
-        
-        # Method 2: Check if entity's device has an area assigned
-        if entity_entry and entity_entry.device_id:
-            device_registry = hass.helpers.device_registry.async_get(hass)
-            device = device_registry.async_get(entity_entry.device_id)
-            if device and device.area_id:
-                _LOGGER.debug("Entity %s has area via device %s: %s", 
-                             entity_id, device.id, device.area_id)
-                return device.area_id
-        
-        # Method 3: Check if entity name contains an area name
-        # This is a fallback for entities not properly registered
-        area_reg = area_registry.async_get(hass)
-        state = hass.states.get(entity_id)
-        
-        if state and state.name:
-            # Check if any area name is in the entity name or entity_id
-            entity_name = state.name.lower()
-            entity_id_lower = entity_id.lower()
-            
-            for area_id, area in area_reg.areas.items():
-                area_name = area.name.lower()
-                # Check for area name match in entity name or ID
-                if (area_name in entity_name or 
-                    area_name.replace(' ', '_') in entity_id_lower or
-                    area_name.replace(' ', '') in entity_id_lower):
-                    _LOGGER.debug("Entity %s matched to area %s by name", entity_id, area.name)
-                    return area_id
-        
-        # Method 4: For manually created entities without area 
-        # assignments directly in their config, try to infer from attributes
-        if state and state.attributes:
-            if 'device_class' in state.attributes and 'room' in entity_id_lower:
-                # Extract room name from entity_id for sensor.bedroom_temperature
-                parts = entity_id_lower.split('_')
-                if len(parts) > 1:
-                    potential_room = parts[0].split('.')[1]  # Remove domain
-                    # Check if this room name corresponds to an area
-                    for area_id, area in area_reg.areas.items():
-                        if potential_room in area.name.lower():
-                            _LOGGER.debug("Entity %s matched to area %s by room inference", 
-                                         entity_id, area.name)
-                            return area_id
-        
-        # Log that we couldn't find an area
+        dev_registry = area_reg = None
+    else:
+        entity_registry, dev_registry, area_reg = registries
+    
+    # Method 1: Check entity registry for direct area assignment
+    entity_entry = entity_registry.async_get(entity_id)
+    
+    if entity_entry and entity_entry.area_id:
+        _LOGGER.debug("Entity %s has direct area assignment: %s", entity_id, entity_entry.area_id)
+        return entity_entry.area_id
+    
+    # Method 2: Check if entity's device has an area assigned
+    if entity_entry and entity_entry.device_id:
+        if dev_registry is None:
+            dev_registry = device_registry.async_get(hass)
+        device = dev_registry.async_get(entity_entry.device_id)
+        if device and device.area_id:
+            _LOGGER.debug("Entity %s has area via device %s: %s", 
+                         entity_id, device.id, device.area_id)
+            return device.area_id
+    
+    # Method 3: Check if entity name contains an area name
+    # This is a fallback for entities not properly registered
+    state = hass.states.get(entity_id)
+    if not state:
         _LOGGER.debug("Could not determine area for entity %s", entity_id)
         return None
-        
-    except Exception as e:
-        _LOGGER.warning("Error getting area for entity %s: %s", entity_id, e)
-        import traceback
-        _LOGGER.debug("Traceback: %s", traceback.format_exc())
-        return None
+    
+    if area_reg is None:
+        area_reg = area_registry.async_get(hass)
+    entity_id_lower = entity_id.lower()
+    
+    if state.name:
+        # Check if any area name is in the entity name or entity_id
+        entity_name = state.name.lower()
+        
+        for area in area_reg.areas.values():
+            area_name, area_underscored, area_squashed = _area_name_variants(area.name)
+            # Check for area name match in entity name or ID
+            if (area_name in entity_name or 
+                area_underscored in entity_id_lower or
+                area_squashed in entity_id_lower):
+                _LOGGER.debug("Entity %s matched to area %s by name", entity_id, area.name)
+                return area.id
+    
+    # Method 4: For manually created entities without area 
+    # assignments directly in their config, try to infer from attributes
+    if 'device_class' in state.attributes and 'room' in entity_id_lower:
+        # Extract room name from entity_id for sensor.bedroom_temperature
+        object_id = entity_id_lower.partition('.')[2]  # Remove domain
+        potential_room, separator, _ = object_id.partition('_')
+        if separator:
+            # Check if this room name corresponds to an area
+            for area in area_reg.areas.values():
+                if potential_room in _area_name_variants(area.name)[0]:
+                    _LOGGER.debug("Entity %s matched to area %s by room inference", 
+                                 entity_id, area.name)
+                    return area.id
+    
+    # Log that we couldn't find an area
+    _LOGGER.debug("Could not determine area for entity %s", entity_id)
+    return None
 
 
-def get_entities_in_area(hass: HomeAssistant, area_id: str) -> List[str]:
+def build_area_entity_index(
+    hass: HomeAssistant, *, registries: Optional[Tuple[Any, Any, Any]] = None
+) -> Dict[str, Dict[str, List[str]]]:
+    """Map each area ID to its entities, grouped by domain."""
+    if registries is None:
+        registries = get_registries(hass)
+    entity_registry, dev_registry, _ = registries
+    device_areas = {
+        device.id: device.area_id
+        for device in dev_registry.devices.values()
+        if device.area_id
+    }
+    
+    area_index: Dict[str, Dict[str, List[str]]] = {}
+    for entry in entity_registry.entities.values():
+        # Entities without an area of their own inherit their device's area
+        area_id = entry.area_id or device_areas.get(entry.device_id)
+        if area_id:
+            area_index.setdefault(area_id, {}).setdefault(
+                entry.domain, []
+            ).append(entry.entity_id)
+    
+    return area_index
+
+
+def get_entities_in_area(
+    hass: HomeAssistant, area_id: str, area_index: Optional[Dict[str, Dict[str, List[str]]]] = None
+) -> List[str]:
     """Get all entities in a specific area."""
-    entity_registry = async_get_entity_registry(hass)
-    area_entities = []
+    if area_index is None:
+        area_index = build_area_entity_index(hass)
     
-    # First, get entities directly assigned to this area
-    for entity_id, entry in entity_registry.entities.items():
-        if entry.area_id == area_id:
-            area_entities.append(entity_id)
+    return [
+        entity_id
+        for entity_ids in area_index.get(area_id, {}).values()
+        for entity_id in entity_ids
+    ]
+
+
+def _service_options(service_map: Dict[str, str]) -> List[dict]:
+    """Convert a service map to selector options."""
+    service_options = [
+        {
+            "value": service_id,
+            "label": f"{service_name} ({service_id})"
+        }
+        for service_id, service_name in service_map.items()
+    ]
     
-    # Then get entities whose devices are in this area
-    device_registry = hass.helpers.device_registry.async_get()
-    for device_id, device in device_registry.devices.items():
-        if device.area_id == area_id:
-            # Find entities attached to this device
-            for entity_id, entry in entity_registry.entities.items():
-                if entry.device_id == device_id and entity_id not in area_entities:
-                    area_entities.append(entity_id)
+    # Add a custom action option
+    service_options.append(CUSTOM_ACTION_OPTION)
     
-    return area_entities
+    return service_options
+
+
+DEFAULT_SERVICE_OPTIONS = tuple(_service_options(DEFAULT_SERVICES))
 
 
-def get_services_for_area(hass: HomeAssistant, area_id: str) -> List[dict]:
+@lru_cache(maxsize=32)
+def _domain_service_options(domains: Tuple[str, ...]) -> Tuple[dict, ...]:
+    """Get the service options for a combination of domains."""
+    service_map = {}
+    for domain in domains:
+        service_map.update(DOMAIN_SERVICES[domain])
+    return tuple(_service_options(service_map))
+
+
+def get_services_for_area(
+    hass: HomeAssistant, area_id: str, area_index: Optional[Dict[str, Dict[str, List[str]]]] = None
+) -> List[dict]:
     """Get all available services for entities in an area."""
-    service_options = []
-    area_entities = []
+    # For custom areas, we can't get entities (yet), so offer the defaults
+    if area_id.partition(".")[0] == "custom":
+        return list(DEFAULT_SERVICE_OPTIONS)
     
-    # Get all entities in this area
-    if area_id == "custom":
-        # For custom areas, we can't get entities (yet)
-        pass
-    else:
-        area_entities = get_entities_in_area(hass, area_id)
+    # Get all entities in this area, grouped by domain
+    if area_index is None:
+        area_index = build_area_entity_index(hass)
+    area_domains = area_index.get(area_id, {})
     
-    # Generate service options based on discovered entities
-    service_map = {}
+    # Find the domains with discovered entities that offer services
+    domains = []
     
-    for entity_id in area_entities:
-        # Skip if we can't get the entity state
-        state = hass.states.get(entity_id)
-        if not state:
+    for domain, entity_ids in area_domains.items():
+        # Only include supported domains that offer standard services
+        if domain not in SUPPORTED_DOMAINS or domain not in DOMAIN_SERVICES:
             continue
-            
-        domain = entity_id.split(".", 1)[0]
         
-        # Only include supported domains
-        if domain not in SUPPORTED_DOMAINS:
+        # Skip domains where we can't get any entity state
+        if not any(hass.states.get(entity_id) for entity_id in entity_ids):
             continue
         
-        # Standard services based on domain
-        if domain in SERVICE_CATEGORY_TOGGLE:
-            for service in ["turn_on", "turn_off", "toggle"]:
-                service_id = f"{domain}.{service}"
-                if service_id not in service_map:
-                    service_name = f"{service.replace('_', ' ').title()} {domain.replace('_', ' ').title()}"
-                    service_map[service_id] = service_name
-        
-        elif domain in SERVICE_CATEGORY_COVER:
-            for service in ["open_cover", "close_cover", "set_cover_position"]:
-                service_id = f"{domain}.{service}"
-                if service_id not in service_map:
-                    service_name = f"{service.replace('_', ' ').title().replace('Cover', '')}"
-                    service_map[service_id] = service_name
-        
-        elif domain in SERVICE_CATEGORY_CLIMATE:
-            for service in ["set_temperature", "set_hvac_mode"]:
-                service_id = f"{domain}.{service}"
-                if service_id not in service_map:
-                    service_name = f"{service.replace('_', ' ').title().replace('Hvac', 'HVAC')}"
-                    service_map[service_id] = service_name
-        
-        elif domain in SERVICE_CATEGORY_MEDIA:
-            for service in ["play_media", "media_play", "media_pause", "media_stop", "volume_set"]:
-                service_id = f"{domain}.{service}"
-                if service_id not in service_map:
-                    service_name = f"{service.replace('_', ' ').title().replace('Media', '')}"
-                    service_map[service_id] = service_name
-    
-    # If no entities were found or this is a custom area, add some default services
-    if not service_map:
-        default_services = {
-            "light.turn_on": "Turn On Lights",
-            "light.turn_off": "Turn Off Lights",
-            "switch.turn_on": "Turn On Switch",
-            "switch.turn_off": "Turn Off Switch",
-        }
-        service_map.update(default_services)
+        domains.append(domain)
     
-    # Convert the map to selector options
-    for service_id, service_name in service_map.items():
-        service_options.append({
-            "value": service_id,
-            "label": f"{service_name} ({service_id})"
-        })
+    # If no entities were found, add some default services
+    if not domains:
+        return list(DEFAULT_SERVICE_OPTIONS)
     
-    # Add a custom action option
-    service_options.append({
-        "value": "custom",
-        "label": "Custom Action (enter name)"
-    })
-    
-    return service_options
+    # Sort so areas with the same mix of domains share a cache entry
+    return list(_domain_service_options(tuple(sorted(domains))))
 
 
 class JerkinsAIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -255,6 +348,21 @@ class JerkinsAIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._action_mappings = {}
         self._current_sensor = None
         self._current_area = None
+        self._sensor_idx = 0
+        self._area_idx = 0
+        self._unique_areas = []
+        self._unique_area_set = set()
+        self._area_entity_index = None
+        self._registries = None
+        self._sensor_options = None
+        self._area_options = None
+        self._service_options = {}
+
+    def _get_registries(self) -> Tuple[Any, Any, Any]:
+        """Get the entity, device and area registries, once per flow."""
+        if self._registries is None:
+            self._registries = get_registries(self.hass)
+        return self._registries
 
     async def async_step_user(self, user_input=None) -> FlowResult:
         """Handle the initial step."""
@@ -264,12 +372,7 @@ class JerkinsAIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id=STEP_USER,
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_NAME, default=DEFAULT_NAME): str,
-                    vol.Required(CONF_POLLING_INTERVAL, default=DEFAULT_POLLING_INTERVAL): int,
-                }
-            ),
+            data_schema=USER_SCHEMA,
         )
 
     async def async_step_sensors(self, user_input=None) -> FlowResult:
@@ -291,23 +394,16 @@ class JerkinsAIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 
                 # Set up for the actions step
                 self._unique_areas = ["default"]
+                self._area_idx = 0
                 self._current_area = "default"
                 
                 # Skip directly to actions step
                 return await self.async_step_actions()
         
-        # Get all sensors without filtering by area
-        sensor_options = []
-        states = self.hass.states.async_all()
-        
-        for state in states:
-            # Include both sensors and binary sensors
-            if state.domain == "sensor" or state.domain == "binary_sensor":
-                entity_id = state.entity_id
-                sensor_options.append({
-                    "value": entity_id,
-                    "label": f"{state.name} ({entity_id})"
-                })
+        # Get all sensors without filtering by area, once per flow
+        if self._sensor_options is None:
+            self._sensor_options = get_sensor_entities(self.hass)
+        sensor_options = self._sensor_options
         
         if not sensor_options:
             return self.async_abort(reason="no_sensors_available")
@@ -347,25 +443,26 @@ class JerkinsAIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 # Store area mapping for current sensor
                 self._area_mappings[self._current_sensor] = area
+                if area not in self._unique_area_set:
+                    self._unique_area_set.add(area)
+                    self._unique_areas.append(area)
                 
-                # Find the next sensor without an area
-                next_sensor = None
-                for sensor_id in self._sensors:
-                    if sensor_id not in self._area_mappings:
-                        next_sensor = sensor_id
-                        break
-                
-                if next_sensor:
-                    self._current_sensor = next_sensor
+                # Move on to the next sensor
+                self._sensor_idx += 1
+                if self._sensor_idx < len(self._sensors):
+                    self._current_sensor = self._sensors[self._sensor_idx]
                     return await self.async_step_areas()
                 else:
                     # All sensors have areas, move to actions
                     self._data[CONF_AREA_MAPPINGS] = self._area_mappings
-                    self._unique_areas = list(set(self._area_mappings.values()))
+                    self._area_idx = 0
                     self._current_area = self._unique_areas[0]
                     return await self.async_step_actions()
         
-        area_options = get_area_list(self.hass)
+        # The area list is the same for every sensor, so build it once
+        if self._area_options is None:
+            self._area_options = get_area_list(self.hass)
+        area_options = self._area_options
         
         # Get the friendly name of the current sensor for the UI
         sensor_state = self.hass.states.get(self._current_sensor)
@@ -401,17 +498,17 @@ class JerkinsAIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         
         if user_input is not None:
-            actions = user_input.get("actions", [])
+            # Drop the "custom" placeholder from the selected actions
+            actions = [action for action in user_input.get("actions", []) if action != "custom"]
             custom_actions = user_input.get("custom_actions", "")
             
-            # Process custom actions if any
+            # Process custom actions if any, ignoring empty entries
             if custom_actions:
-                custom_action_list = [action.strip() for action in custom_actions.split(",")]
-                actions.extend(custom_action_list)
-            
-            # Remove "custom" from actions if present
-            if "custom" in actions:
-                actions.remove("custom")
+                actions.extend(
+                    action for action in (
+                        entry.strip() for entry in custom_actions.split(",")
+                    ) if action
+                )
             
             if not actions:
                 errors["base"] = "no_actions"
@@ -420,30 +517,38 @@ class JerkinsAIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 self._action_mappings[self._current_area] = actions
                 
                 # Move to next area or to LLM step
-                area_index = self._unique_areas.index(self._current_area)
-                if area_index < len(self._unique_areas) - 1:
-                    self._current_area = self._unique_areas[area_index + 1]
+                self._area_idx += 1
+                if self._area_idx < len(self._unique_areas):
+                    self._current_area = self._unique_areas[self._area_idx]
                     return await self.async_step_actions()
                 else:
                     # Store action mappings and move to LLM configuration
                     self._data[CONF_ACTION_MAPPINGS] = self._action_mappings
                     return await self.async_step_llm()
         
-        # Dynamically discover services for this area
-        service_options = get_services_for_area(self.hass, self._current_area)
+        # Dynamically discover services for this area, once per area
+        service_options = self._service_options.get(self._current_area)
+        if service_options is None:
+            # Index entities by area once per flow rather than once per area
+            if self._area_entity_index is None:
+                self._area_entity_index = build_area_entity_index(
+                    self.hass, registries=self._get_registries()
+                )
+            
+            service_options = get_services_for_area(
+                self.hass, self._current_area, self._area_entity_index
+            )
+            self._service_options[self._current_area] = service_options
         
         # Get area name for display
+        area_prefix, _, custom_name = self._current_area.partition(".")
         area_name = self._current_area
-        if self._current_area.startswith("custom."):
-            area_name = self._current_area.split(".", 1)[1]
+        if area_prefix == "custom" and custom_name:
+            area_name = custom_name
         else:
-            try:
-                ar_registry = area_registry.async_get(self.hass)
-                area_obj = ar_registry.async_get_area(self._current_area)
-                if area_obj:
-                    area_name = area_obj.name
-            except Exception:
-                pass
+            area_obj = self._get_registries()[2].async_get_area(self._current_area)
+            if area_obj:
+                area_name = area_obj.name
                 
         description_placeholders = {"area": area_name}
         
@@ -474,15 +579,15 @@ class JerkinsAIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         
         if user_input is not None:
-            url = user_input.get(CONF_URL)
+            url = (user_input.get(CONF_URL) or "").strip()
+            
+            # Automatically fix common URL formatting issues
+            if url and not url.startswith(("http://", "https://")):
+                url = f"http://{url}"
             
-            if not url:
+            if not URL_PATTERN.match(url):
                 errors[CONF_URL] = "invalid_url"
             else:
-                # Automatically fix common URL formatting issues
-                if not url.startswith("http://") and not url.startswith("https://"):
-                    url = f"http://{url}"
-                
                 # For Ollama, ensure we have the correct API endpoint
                 if "ollama" in self.hass.config.components or "ollama" in url.lower() or "11434" in url:
                     if not url.endswith("/api/generate"):
@@ -500,11 +605,7 @@ class JerkinsAIConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         
         return self.async_show_form(
             step_id=STEP_LLM,
-            data_schema=vol.Schema(
-                {
-                    vol.Required(CONF_URL): str,
-                }
-            ),
+            data_schema=LLM_SCHEMA,
             description_placeholders={
                 "example_url": "http://192.168.1.159:11434/api/generate"
             },
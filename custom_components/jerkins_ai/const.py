@@ -7,7 +7,42 @@ CONF_SENSORS = "sensors"
 CONF_AREA_MAPPINGS = "area_mappings"
 CONF_ACTION_MAPPINGS = "action_mappings"
 CONF_POLLING_INTERVAL = "polling_interval"
-DEFAULT_POLLING_INTERVAL = 60  # in seconds
+DEFAULT_POLLING_INTERVAL = 600  # in seconds, safety net for missed state changes
+STATE_CHANGE_DEBOUNCE = 2.0  # in seconds
+POLLING_BACKOFF_THRESHOLD = 3  # unchanged updates before backing off
+POLLING_BACKOFF_MAX = 10  # maximum multiple of the polling interval
+
+# Delay before persisting mapping changes, so bursts are written once
+CONFIG_SAVE_DELAY = 2.0  # in seconds
+
+# LLM requests
+LLM_CONNECT_TIMEOUT = 10  # in seconds
+LLM_READ_TIMEOUT = 30  # in seconds, between streamed chunks
+LLM_GENERATION_TIMEOUT = 120  # in seconds, for a whole streamed response
+LLM_RETRY_ATTEMPTS = 3
+LLM_RETRY_INITIAL_DELAY = 1  # in seconds
+LLM_RETRY_MAX_DELAY = 8  # in seconds
+
+# Key in hass.data for the LLM semaphores shared per endpoint
+DATA_LLM_SEMAPHORES = f"{DOMAIN}_llm_semaphores"
+
+# Concurrency limits
+MAX_CONCURRENT_LLM_REQUESTS = 2
+MAX_CONCURRENT_ACTIONS = 8
+
+# LLM response cache
+LLM_CACHE_SIZE = 256
+LLM_CACHE_TTL = 600  # in seconds
+
+# Sensor attributes forwarded to the LLM
+ATTRIBUTE_ALLOWLIST = frozenset({
+    "unit_of_measurement",
+    "device_class",
+    "temperature",
+    "humidity",
+    "battery_level",
+    "brightness",
+})
 
 # Defaults
 DEFAULT_NAME = "Jerkins AI"
@@ -20,8 +55,8 @@ STEP_ACTIONS = "actions"
 STEP_LLM = "llm"
 
 # Service discovery
-SUPPORTED_DOMAINS = ["light", "switch", "climate", "cover", "media_player", "fan", "automation", "script", "binary_sensor"]
-SERVICE_CATEGORY_TOGGLE = ["light", "switch", "fan", "input_boolean"]
-SERVICE_CATEGORY_COVER = ["cover"]
-SERVICE_CATEGORY_CLIMATE = ["climate"]
-SERVICE_CATEGORY_MEDIA = ["media_player"]
\ No newline at end of file
+SUPPORTED_DOMAINS = frozenset({"light", "switch", "climate", "cover", "media_player", "fan", "automation", "script", "binary_sensor"})
+SERVICE_CATEGORY_TOGGLE = frozenset({"light", "switch", "fan", "input_boolean"})
+SERVICE_CATEGORY_COVER = frozenset({"cover"})
+SERVICE_CATEGORY_CLIMATE = frozenset({"climate"})
+SERVICE_CATEGORY_MEDIA = frozenset({"media_player"})
\ No newline at end of file